@@ -0,0 +1,51 @@
+/*
+ * Writes all catalan(n) balanced bracket strings of length 2n into out, one after another
+ * (row i at out + i*2n, no separators or NUL terminators), in the same order as
+ * generate_parentheses in brackets.py. The caller allocates catalan(n) * 2n bytes.
+ * Returns 0 on success, -1 if the working stacks could not be allocated.
+ *
+ * Build: cc -O3 -march=native -shared -fPIC -o libbrackets.so brackets.c
+ */
+#include <stdlib.h>
+#include <string.h>
+
+int gen(int n, char *out)
+{
+    int n2 = 2 * n;
+    if (n <= 0)
+        return 0;
+
+    /* iterative dfs; each entry writes ch at buf[pos] and carries the bracket counts so far */
+    char *buf = malloc(n2);
+    int *pos_s = malloc((n2 + 1) * sizeof(int));
+    int *open_s = malloc((n2 + 1) * sizeof(int));
+    int *closed_s = malloc((n2 + 1) * sizeof(int));
+    char *ch_s = malloc(n2 + 1);
+    if (!buf || !pos_s || !open_s || !closed_s || !ch_s) {
+        free(buf); free(pos_s); free(open_s); free(closed_s); free(ch_s);
+        return -1;
+    }
+
+    int top = 0;
+    pos_s[top] = 0; ch_s[top] = '('; open_s[top] = 1; closed_s[top] = 0; top++;
+    while (top > 0) {
+        top--;
+        int pos = pos_s[top], open_num = open_s[top], closed_num = closed_s[top];
+        buf[pos++] = ch_s[top];
+        if (pos == n2) {
+            memcpy(out, buf, n2);
+            out += n2;
+            continue;
+        }
+        /* push ")" first so the "(" branch is popped first */
+        if (closed_num < open_num) {
+            pos_s[top] = pos; ch_s[top] = ')'; open_s[top] = open_num; closed_s[top] = closed_num + 1; top++;
+        }
+        if (open_num < n) {
+            pos_s[top] = pos; ch_s[top] = '('; open_s[top] = open_num + 1; closed_s[top] = closed_num; top++;
+        }
+    }
+
+    free(buf); free(pos_s); free(open_s); free(closed_s); free(ch_s);
+    return 0;
+}
@@ -21,15 +21,26 @@ Exports:
 Other:
 - R = reset, G = grid toggle
 
-Tested on Python 3.13. Fractions are constructed with integer math only.
+Tested on Python 3.13. Coordinates are stored as floats; Fractions are only used to
+display them (nearest rational with denominator <= 10**ROUND_DP).
 """
 
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from math import sqrt
+from math import sqrt, ceil
 from fractions import Fraction
+from functools import lru_cache
 import json
-import copy  # NEW: for undo/redo deep copies
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; nearest-segment search falls back to a plain loop
+    np = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the slower fallback
+    orjson = None
 
 # -------- Config --------
 WORLD_RANGE = 30                 # world coords are clamped to [-WORLD_RANGE, +WORLD_RANGE]
@@ -44,19 +55,41 @@ SNAP_TO_INTEGER = True     # default ON
 WORLD_BORDER_VISIBLE = False  # hide the box unless you want it
 
 # -------- Helpers --------
+def to_frac(v):
+    # stored floats come from lattice/pixel coordinates, so the closest small rational is exact
+    return v if isinstance(v, Fraction) else Fraction(v).limit_denominator(10**ROUND_DP)
+
+@lru_cache(maxsize=4096)  # the sidebar re-formats the same coordinates after every click
 def frac_fmt(v):
-    if isinstance(v, Fraction):
-        return f"{v.numerator}/{v.denominator}" if v.denominator != 1 else f"{v.numerator}"
-    return f"{v:.{ROUND_DP}f}"
+    # floats are shown as the closest small rational, e.g. 0.44 -> 11/25
+    v = to_frac(v)
+    return f"{v.numerator}/{v.denominator}" if v.denominator != 1 else f"{v.numerator}"
 
 def frac_min(a, b): return a if a <= b else b
 def frac_max(a, b): return a if a >= b else b
 
 def dot(ax, ay, bx, by):
-    return ax * bx + ay * by  # supports Fractions
-
-def to_float(v):
-    return float(v.numerator) / float(v.denominator) if isinstance(v, Fraction) else float(v)
+    return ax * bx + ay * by
+
+def dumps_json(data):
+    # orjson and json parse back to the same values but are not byte-identical:
+    # e.g. tiny float leftovers serialize as 1e-7 vs 1e-07
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+def zigzag_coords(positions, lo, hi, vertical):
+    # one polyline covering many parallel grid lines: consecutive lines are joined along the
+    # canvas edge (lo/hi), so a single create_line call draws all of them
+    coords = []
+    a, b = lo, hi
+    for p in positions:
+        if vertical:
+            coords.extend((p, a, p, b))
+        else:
+            coords.extend((a, p, b, p))
+        a, b = b, a
+    return coords
 
 # -------- App --------
 class App:
@@ -99,14 +132,39 @@ class App:
         # dynamic pixels-per-unit so [-WORLD_RANGE, WORLD_RANGE]^2 always fits
         self.px_per_unit = DEFAULT_PX_PER_UNIT
 
+        # canvas size and screen center, cached so transforms don't query Tk on every call
+        self._w = self._h = 2
+        self._cx = self._cy = 1.0
+        self._endpoint_grid = None      # snap index: screen cell -> endpoints (None = rebuild)
+        self._item_ids = {}             # obj id ("L1", "S1", "P1") -> canvas item ids
+        self._redraw_pending = False    # a full redraw is queued with after_idle
+        self._resize_after_id = None    # pending after_idle callback for a coalesced resize
+
+        # segment geometry mirrored as NumPy arrays (row i <-> self.segments[i]) for vectorized
+        # nearest-segment projection; rows past len(self.segments) are stale/unused
+        if np is not None:
+            self._seg_p0 = np.empty((64, 2))
+            self._seg_v = np.empty((64, 2))
+            self._seg_vv = np.empty(64)
+
         # History (Undo/Redo)
-        self.history = []   # stack of snapshots
-        self.future  = []   # stack of undone states
-        self._restoring = False
+        self.history = []   # stack of (op_type, payload) deltas
+        self.future  = []   # stack of undone deltas
+        self._export_cache = None   # export_json() result for the current data
+
+        # Sidebar refreshes are coalesced through after_idle
+        self._sidebar_status = None
+        self._sidebar_after_id = None
+
+        # Click handler per mode; all take (world_pt, sx, sy)
+        self._mode_handlers = {
+            "segment": self.handle_segment_click,
+            "point": self.handle_point_click,
+            "puncture": self.handle_puncture_click,
+        }
 
         # Bindings
         self.canvas.bind("<Button-1>", self.on_click)
-        self.canvas.bind("<Button>", self.on_click)
         # Recompute px/unit whenever the canvas size changes
         self.canvas.bind("<Configure>", self.on_resize)
 
@@ -144,112 +202,176 @@ class App:
 
         self.root.update_idletasks()
         # initialize px/unit and draw
-        self.on_resize(None)
-        # initial snapshot for undo
-        self.push_state("init")
+        self.apply_resize()
 
     # ----- Auto-fit pixels-per-unit -----
-    def on_resize(self, event):
+    def cache_canvas_size(self):
         w = max(self.canvas.winfo_width(), 2)
         h = max(self.canvas.winfo_height(), 2)
+        if (w, h) != (self._w, self._h):
+            self._endpoint_grid = None
+        self._w, self._h = w, h
+        self._cx = self._w / 2
+        self._cy = self._h / 2
+
+    def on_resize(self, event):
+        # <Configure> fires for every pixel of a window drag; coalesce a burst into one rebuild
+        if self._resize_after_id is None:
+            self._resize_after_id = self.root.after_idle(self.apply_resize)
+
+    def apply_resize(self):
+        self._resize_after_id = None
+        self.cache_canvas_size()
+        w, h = self._w, self._h
         usable_w = max(w - 2*BORDER_PADDING_PX, 2)
         usable_h = max(h - 2*BORDER_PADDING_PX, 2)
         # choose limiting dimension: we need 2*WORLD_RANGE units across
-        # ensure integer px/unit (for integer-only Fractions in screen_to_world)
+        # keep px/unit an integer so lattice points land on whole pixels
         self.px_per_unit = max(1, min(usable_w, usable_h) // (2 * WORLD_RANGE))
-        self.redraw()
+        self._endpoint_grid = None
+        self.relayout()
 
-    # ----- Coordinate transforms (integer-only Fractions for 3.13 compatibility) -----
+    # ----- Coordinate transforms (plain floats; Fractions only for display) -----
     def world_to_screen(self, x, y):
-        w = max(self.canvas.winfo_width(), 2)
-        h = max(self.canvas.winfo_height(), 2)
-        cx, cy = w/2, h/2
-        sx = cx + to_float(x) * self.px_per_unit
-        sy = cy - to_float(y) * self.px_per_unit
+        sx = self._cx + x * self.px_per_unit
+        sy = self._cy - y * self.px_per_unit
         return sx, sy
 
     def screen_to_world(self, sx, sy):
-        w = max(self.canvas.winfo_width(), 2)
-        h = max(self.canvas.winfo_height(), 2)
-
-        # Fractions with integer numerators/denominators (Py 3.13-safe)
-        num_x = 2 * int(sx) - int(w)
-        den_x = 2 * self.px_per_unit
-        x = Fraction(num_x, den_x)
-
-        num_y = int(h) - 2 * int(sy)
-        den_y = 2 * self.px_per_unit
-        y = Fraction(num_y, den_y)
-
-        # Optional snap to nearest integer lattice
+        # Snap to nearest integer lattice (default): round and clamp as ints
         if getattr(self, "snap_to_integer", False):
-            x = Fraction(round(float(x)), 1)
-            y = Fraction(round(float(y)), 1)
+            ix = round((int(sx) - self._cx) / self.px_per_unit)
+            iy = round((self._cy - int(sy)) / self.px_per_unit)
+            ix = max(-WORLD_RANGE, min(WORLD_RANGE, ix))
+            iy = max(-WORLD_RANGE, min(WORLD_RANGE, iy))
+            return float(ix), float(iy)
+
+        w, h = self._w, self._h
+        x = (2 * int(sx) - int(w)) / (2 * self.px_per_unit)
+        y = (int(h) - 2 * int(sy)) / (2 * self.px_per_unit)
 
         # Clamp to world box [-WORLD_RANGE, WORLD_RANGE]
-        if x < -WORLD_RANGE: x = Fraction(-WORLD_RANGE, 1)
-        if x >  WORLD_RANGE: x = Fraction( WORLD_RANGE, 1)
-        if y < -WORLD_RANGE: y = Fraction(-WORLD_RANGE, 1)
-        if y >  WORLD_RANGE: y = Fraction( WORLD_RANGE, 1)
+        x = float(max(-WORLD_RANGE, min(WORLD_RANGE, x)))
+        y = float(max(-WORLD_RANGE, min(WORLD_RANGE, y)))
 
         return x, y
 
     # ----- History (Undo/Redo) -----
-    def snapshot(self):
-        return {
-            "mode": self.mode,
-            "pending_p0": copy.deepcopy(self.pending_p0),
-            "segments": copy.deepcopy(self.segments),
-            "special_points": copy.deepcopy(self.special_points),
-            "punctures": copy.deepcopy(self.punctures),
+    # Actions are recorded as (op_type, payload) deltas instead of full snapshots:
+    #   ("add_segment", seg), ("add_point", sp), ("add_puncture", pu), ("reset", prior_state)
+    # Items are append-only, so only "reset" has to stash anything (the prior lists, by reference).
+    def push_state(self, op_type, payload):
+        self.history.append((op_type, payload))
+        self.future.clear()  # invalidate redo on new action
+        self._export_cache = None
+
+    def clear_all(self):
+        prior = {
+            "pending_p0": self.pending_p0,
+            "segments": self.segments,
+            "special_points": self.special_points,
+            "punctures": self.punctures,
             "next_seg_id": self.next_seg_id,
             "next_sp_id": self.next_sp_id,
             "next_puncture_id": self.next_puncture_id,
-            "grid_on": self.grid_on,
-            "chain_mode": self.chain_mode,
         }
+        # fresh lists (not .clear()) so the stashed ones survive for undo
+        self.pending_p0 = None
+        self.segments = []
+        self._endpoint_grid = None
+        self.special_points = []
+        self.punctures = []
+        self.next_seg_id = 1
+        self.next_sp_id = 1
+        self.next_puncture_id = 1
+        return prior
 
-    def restore_state(self, s):
-        self._restoring = True
-        try:
-            self.mode = s["mode"]
-            self.pending_p0 = copy.deepcopy(s["pending_p0"])
-            self.segments = copy.deepcopy(s["segments"])
-            self.special_points = copy.deepcopy(s["special_points"])
-            self.punctures = copy.deepcopy(s["punctures"])
-            self.next_seg_id = s["next_seg_id"]
-            self.next_sp_id = s["next_sp_id"]
-            self.next_puncture_id = s["next_puncture_id"]
-            self.grid_on = s["grid_on"]
-            self.chain_mode = s["chain_mode"]
-            self.redraw()
-            self.render_sidebar(status="State restored.")
-        finally:
-            self._restoring = False
-
-    def push_state(self, label=None):
-        if self._restoring:
-            return
-        self.history.append(self.snapshot())
-        self.future.clear()  # invalidate redo on new action
+    def apply_op(self, op_type, payload):
+        """Re-apply an op (redo); returns the payload to keep on the undo stack."""
+        if op_type == "add_segment":
+            self.append_segment(payload)
+            self.next_seg_id += 1
+            self.pending_p0 = payload["p1"] if self.chain_mode else None
+        elif op_type == "add_point":
+            self.special_points.append(payload)
+            self.next_sp_id += 1
+        elif op_type == "add_puncture":
+            self.punctures.append(payload)
+            self.next_puncture_id += 1
+        elif op_type == "reset":
+            payload = self.clear_all()
+        return payload
+
+    def revert_op(self, op_type, payload):
+        """Apply the inverse of an op (undo)."""
+        if op_type == "add_segment":
+            self.segments.pop()
+            self._endpoint_grid = None
+            self.next_seg_id -= 1
+            self.pending_p0 = self.segments[-1]["p1"] if (self.chain_mode and self.segments) else None
+        elif op_type == "add_point":
+            self.special_points.pop()
+            self.next_sp_id -= 1
+        elif op_type == "add_puncture":
+            self.punctures.pop()
+            self.next_puncture_id -= 1
+        elif op_type == "reset":
+            for key, value in payload.items():
+                setattr(self, key, value)
+            self.rebuild_segment_arrays()
+            self._endpoint_grid = None
+
+    # ----- Segment arrays (for nearest-segment projection) -----
+    def append_segment(self, seg):
+        self.segments.append(seg)
+        self.index_segment_endpoints(len(self.segments) - 1, seg)
+        if np is not None:
+            self.store_segment_row(len(self.segments) - 1, seg)
+
+    def store_segment_row(self, i, seg):
+        if i >= len(self._seg_vv):
+            cap = 2 * len(self._seg_vv)
+            self._seg_p0 = np.resize(self._seg_p0, (cap, 2))
+            self._seg_v = np.resize(self._seg_v, (cap, 2))
+            self._seg_vv = np.resize(self._seg_vv, cap)
+        (p0x, p0y), (p1x, p1y) = seg["p0"], seg["p1"]
+        vx, vy = p1x - p0x, p1y - p0y
+        self._seg_p0[i] = (p0x, p0y)
+        self._seg_v[i] = (vx, vy)
+        self._seg_vv[i] = dot(vx, vy, vx, vy)
+
+    def rebuild_segment_arrays(self):
+        if np is not None:
+            for i, seg in enumerate(self.segments):
+                self.store_segment_row(i, seg)
 
     def undo(self):
-        if len(self.history) <= 1:
+        if not self.history:
             self.render_sidebar(status="Nothing to undo.")
             return
-        cur = self.history.pop()
-        prev = self.history[-1]
-        self.future.append(cur)
-        self.restore_state(prev)
+        op_type, payload = self.history.pop()
+        self.revert_op(op_type, payload)
+        self._export_cache = None
+        self.future.append((op_type, payload))
+        if op_type == "reset":
+            self.request_redraw()
+        else:
+            self.erase_item(payload["id"])
+        self.render_sidebar(status="State restored.")
 
     def redo(self):
         if not self.future:
             self.render_sidebar(status="Nothing to redo.")
             return
-        nxt = self.future.pop()
-        # Keep stack monotonic forward
-        self.history.append(nxt)
-        self.restore_state(nxt)
+        op_type, payload = self.future.pop()
+        payload = self.apply_op(op_type, payload)
+        self.history.append((op_type, payload))
+        self._export_cache = None
+        if op_type == "reset":
+            self.request_redraw()
+        else:
+            self.draw_item(op_type, payload)
+        self.render_sidebar(status="State restored.")
 
     # ----- Mode / UI -----
     def set_mode(self, mode):
@@ -266,48 +388,54 @@ class App:
         elif not self.chain_mode:
             self.pending_p0 = None
         self.render_sidebar(status=f"Chain Mode {'ON' if self.chain_mode else 'OFF'}")
-        self.redraw()
+        self.draw_pending()
 
     def reset(self):
-        # Make reset undoable: push current state first
-        self.push_state("pre-reset")
-        self.pending_p0 = None
-        self.segments.clear()
-        self.special_points.clear()
-        self.punctures.clear()
-        self.next_seg_id = 1
-        self.next_sp_id = 1
-        self.next_puncture_id = 1
-        self.redraw()
+        # Make reset undoable: the prior lists are kept on the history stack
+        self.push_state("reset", self.clear_all())
+        self.request_redraw()
         self.render_sidebar(status="Cleared all. (Undo with Ctrl+Z)")
-        # Snapshot the blank state for redo
-        self.push_state("post-reset")
 
     def toggle_grid(self):
         self.grid_on = not self.grid_on
-        self.redraw()
+        if self.grid_on:
+            self.draw_grid()
+            self.canvas.tag_lower("grid")
+        else:
+            self.canvas.delete("grid")
 
     # ----- Endpoint SNAP logic -----
-    def list_endpoints(self):
-        eps = []
-        for seg in self.segments:
-            eps.append((seg["p0"], f"{seg['id']}.P0"))
-            eps.append((seg["p1"], f"{seg['id']}.P1"))
-        return eps
+    # Endpoints are bucketed by screen position into SNAP_PX-sized cells, so a snap lookup only
+    # scans the cells around the click. The index is built lazily and dropped (set to None)
+    # whenever segments are removed or the screen mapping changes.
+    def index_endpoint(self, world_xy, label, order):
+        ex, ey = self.world_to_screen(world_xy[0], world_xy[1])
+        key = (int(ex // SNAP_PX), int(ey // SNAP_PX))
+        self._endpoint_grid.setdefault(key, []).append((ex, ey, order, world_xy, label))
+
+    def index_segment_endpoints(self, i, seg):
+        if self._endpoint_grid is not None:
+            self.index_endpoint(seg["p0"], f"{seg['id']}.P0", 2 * i)
+            self.index_endpoint(seg["p1"], f"{seg['id']}.P1", 2 * i + 1)
 
     def nearest_endpoint_within_px(self, sx, sy, max_px=SNAP_PX):
+        if self._endpoint_grid is None:
+            self._endpoint_grid = {}
+            for i, seg in enumerate(self.segments):
+                self.index_segment_endpoints(i, seg)
+        r = ceil(max_px / SNAP_PX)
+        kx, ky = int(sx // SNAP_PX), int(sy // SNAP_PX)
         best = None
-        for world_xy, label in self.list_endpoints():
-            ex, ey = self.world_to_screen(world_xy[0], world_xy[1])
-            d2 = (ex - sx) ** 2 + (ey - sy) ** 2
-            if best is None or d2 < best[2]:
-                best = (world_xy, label, d2)
-        if best is None:
+        for bx in range(kx - r, kx + r + 1):
+            for by in range(ky - r, ky + r + 1):
+                for ex, ey, order, world_xy, label in self._endpoint_grid.get((bx, by), ()):
+                    d2 = (ex - sx) ** 2 + (ey - sy) ** 2
+                    # ties go to the earliest endpoint, as in a linear scan
+                    if best is None or (d2, order) < (best[2], best[3]):
+                        best = (world_xy, label, d2, order)
+        if best is None or best[2] > max_px * max_px:
             return None
-        d = sqrt(best[2])
-        if d <= max_px:
-            return best[0], best[1], d
-        return None
+        return best[0], best[1], sqrt(best[2])
 
     # ----- Click handling -----
     def on_click(self, event):
@@ -315,12 +443,7 @@ class App:
             return
         sx, sy = event.x, event.y
         p = self.screen_to_world(sx, sy)
-        if self.mode == "segment":
-            self.handle_segment_click(p, sx, sy)
-        elif self.mode == "point":
-            self.handle_point_click(p)
-        else:  # puncture
-            self.handle_puncture_click(p)
+        self._mode_handlers[self.mode](p, sx, sy)
 
     def handle_segment_click(self, p, sx, sy):
         # Chain Mode: p0 forced to last p1; allow snapping of p1
@@ -335,14 +458,14 @@ class App:
                 "color": "#111827",
             }
             self.next_seg_id += 1
-            self.segments.append(seg)
-            self.push_state("add-segment")  # NEW
+            self.append_segment(seg)
+            self.push_state("add_segment", seg)
             self.pending_p0 = seg["p1"]
             msg = f"Added segment {seg['id']} (Chain Mode)."
             if snapped:
                 msg += f" P1 snapped to {snapped[1]}."
             self.render_sidebar(status=msg)
-            self.redraw()
+            self.draw_item("add_segment", seg)
             return
 
         # Chain Mode OFF
@@ -353,7 +476,7 @@ class App:
             if snapped:
                 msg += f" Snapped to {snapped[1]}."
             self.render_sidebar(status=msg + " Click P1 to finish the segment.")
-            self.redraw()
+            self.draw_pending()
         else:
             p0 = self.pending_p0
             snapped = self.nearest_endpoint_within_px(sx, sy)
@@ -361,6 +484,7 @@ class App:
             if p0 == p1:
                 self.render_sidebar(status="Ignored zero-length segment; pick a different P1.")
                 self.pending_p0 = None
+                self.draw_pending()
                 return
             seg = {
                 "id": f"L{self.next_seg_id}",
@@ -369,23 +493,62 @@ class App:
                 "color": "#111827",
             }
             self.next_seg_id += 1
-            self.segments.append(seg)
-            self.push_state("add-segment")  # NEW
+            self.append_segment(seg)
+            self.push_state("add_segment", seg)
             self.pending_p0 = None
             msg = f"Added segment {seg['id']}."
             if snapped:
                 msg += f" P1 snapped to {snapped[1]}."
             self.render_sidebar(status=msg)
-            self.redraw()
+            self.draw_item("add_segment", seg)
 
     def toggle_snap(self):
         self.snap_to_integer = not self.snap_to_integer
         self.render_sidebar(status=f"Snap-to-integer {'ON' if self.snap_to_integer else 'OFF'}")
 
-    def handle_point_click(self, q):
+    def handle_point_click(self, q, sx, sy):
         if not self.segments:
             self.render_sidebar(status="No segments yet. Switch to mode [1] to add one.")
             return
+        seg = self.nearest_segment(q)
+        if seg is None:
+            self.render_sidebar(status="Could not place point (no valid segment).")
+            return
+
+        # the float search only picks the segment; t and xy are redone exactly so that
+        # exported coordinates don't drift (e.g. 2.9999999999999964 instead of 3.0)
+        t, xy = self.exact_projection(seg, q)
+        sp = {
+            "id": f"S{self.next_sp_id}",
+            "seg_id": seg["id"],
+            "t": t,
+            "xy": xy,
+        }
+        self.next_sp_id += 1
+        self.special_points.append(sp)
+        self.push_state("add_point", sp)
+        self.draw_item("add_point", sp)
+        self.render_sidebar(status=f"Added special point {sp['id']} on {sp['seg_id']} at t={frac_fmt(sp['t'])}.")
+
+    def nearest_segment(self, q):
+        """Segment whose clamped orthogonal projection of q is closest, or None.
+
+        Floats are only used to rank segments; exact_projection() gives the stored point.
+        Screen distance is world distance times px_per_unit on both axes, so comparing
+        world distances picks the same segment.
+        """
+        n = len(self.segments)
+        if np is not None:
+            p0 = self._seg_p0[:n]; v = self._seg_v[:n]; vv = self._seg_vv[:n]
+            qv = np.array(q, dtype=float)
+            valid = vv != 0
+            if not valid.any():
+                return None
+            t = np.clip(((qv - p0) * v).sum(axis=1) / np.where(valid, vv, 1.0), 0.0, 1.0)
+            xy = p0 + t[:, None] * v
+            d2 = np.where(valid, ((xy - qv) ** 2).sum(axis=1), np.inf)
+            return self.segments[int(d2.argmin())]
+
         best = None
         for seg in self.segments:
             p0x, p0y = seg["p0"]
@@ -397,140 +560,224 @@ class App:
             q0x, q0y = (q[0] - p0x), (q[1] - p0y)
             t_star = dot(q0x, q0y, vx, vy) / vv
             # clamp to [0,1]
-            if t_star < 0:
-                t = Fraction(0, 1)
-            elif t_star > 1:
-                t = Fraction(1, 1)
-            else:
-                t = t_star
+            t = min(max(t_star, 0.0), 1.0)
             x = p0x + t * vx
             y = p0y + t * vy
-            sx, sy = self.world_to_screen(x, y)
-            qsx, qsy = self.world_to_screen(q[0], q[1])
-            d2 = (sx - qsx) ** 2 + (sy - qsy) ** 2
-            if (best is None) or (d2 < best["d2"]):
-                best = {"seg": seg, "t": t, "xy": (x, y), "d2": d2}
-
-        if best is None:
-            self.render_sidebar(status="Could not place point (no valid segment).")
-            return
-
-        sp = {
-            "id": f"S{self.next_sp_id}",
-            "seg_id": best["seg"]["id"],
-            "t": best["t"],
-            "xy": best["xy"],
-        }
-        self.next_sp_id += 1
-        self.special_points.append(sp)
-        self.push_state("add-special-point")  # NEW
-        self.redraw()
-        self.render_sidebar(status=f"Added special point {sp['id']} on {sp['seg_id']} at t={frac_fmt(sp['t'])}.")
+            d2 = (x - q[0]) ** 2 + (y - q[1]) ** 2
+            if (best is None) or (d2 < best[1]):
+                best = (seg, d2)
+        return best[0] if best else None
+
+    def exact_projection(self, seg, q):
+        """Clamped projection of q onto seg in Fractions, returned as floats (t, (x, y))."""
+        p0x, p0y = map(to_frac, seg["p0"])
+        p1x, p1y = map(to_frac, seg["p1"])
+        qx, qy = map(to_frac, q)
+        vx, vy = (p1x - p0x), (p1y - p0y)
+        t = dot(qx - p0x, qy - p0y, vx, vy) / dot(vx, vy, vx, vy)
+        t = frac_min(frac_max(t, Fraction(0)), Fraction(1))
+        return float(t), (float(p0x + t * vx), float(p0y + t * vy))
 
     # --- Punctures ---
-    def handle_puncture_click(self, p):
+    def handle_puncture_click(self, p, sx, sy):
         pu = {"id": f"P{self.next_puncture_id}", "xy": p}
         self.next_puncture_id += 1
         self.punctures.append(pu)
-        self.push_state("add-puncture")  # NEW
-        self.redraw()
+        self.push_state("add_puncture", pu)
+        self.draw_item("add_puncture", pu)
         self.render_sidebar(status=f"Added puncture {pu['id']}.")
 
     # ----- Drawing -----
+    # Canvas items are persistent: redraw() rebuilds everything (reset, undo of a reset), clicks
+    # only add the items of the new segment/point/puncture, and relayout() moves existing items
+    # on resize. Each object's items carry its id ("L1", "S1", "P1") as a tag, and their item ids
+    # are kept in self._item_ids[obj_id] in the same order as the *_coords() helpers return.
+    def request_redraw(self):
+        # coalesce full rebuilds: at most one per event, run when Tk is idle
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.root.after_idle(self.flush_redraw)
+
+    def flush_redraw(self):
+        self._redraw_pending = False
+        self.redraw()
+
     def redraw(self):
+        self.cache_canvas_size()
         self.canvas.delete("all")
+        self._item_ids = {}
         if self.grid_on:
             self.draw_grid()
         self.draw_axes()
 
-        # Pending P0 marker (when not chaining)
-        if self.mode == "segment" and self.pending_p0 is not None and not self.chain_mode:
-            self.draw_point(self.pending_p0, fill="#1d4ed8")
-
         # Segments
         for seg in self.segments:
             self.draw_segment(seg)
 
         # Special points
         for sp in self.special_points:
-            self.draw_point(sp["xy"], fill="#ef4444")
-            sx, sy = self.world_to_screen(*sp["xy"])
-            self.canvas.create_text(sx + 10, sy - 8, text=sp["id"], fill="#ef4444",
-                                    font=("TkDefaultFont", 10, "bold"))
+            self.draw_special_point(sp)
 
         # Punctures
         for pu in self.punctures:
-            self.draw_puncture(pu["xy"], label=pu["id"])
+            self.draw_puncture(pu)
+
+        self.draw_pending()
+
+    def relayout(self):
+        # new size or px/unit: reposition existing items with coords() instead of recreating them
+        if self._redraw_pending:
+            return  # the pending rebuild uses the new layout
+        self.cache_canvas_size()
+        self.canvas.delete("grid", "axes")
+        self.draw_axes()
+        self.canvas.tag_lower("axes")
+        if self.grid_on:
+            self.draw_grid()
+            self.canvas.tag_lower("grid")
+        for seg in self.segments:
+            self.move_items(seg["id"], self.segment_coords(seg))
+        for sp in self.special_points:
+            self.move_items(sp["id"], self.special_point_coords(sp))
+        for pu in self.punctures:
+            self.move_items(pu["id"], self.puncture_coords(pu))
+        self.draw_pending()
+
+    def move_items(self, obj_id, coords):
+        for item, c in zip(self._item_ids[obj_id], coords):
+            self.canvas.coords(item, *c)
+
+    def draw_pending(self):
+        # Pending P0 marker (when not chaining)
+        if self._redraw_pending:
+            return
+        self.canvas.delete("pending")
+        if self.mode == "segment" and self.pending_p0 is not None and not self.chain_mode:
+            self.draw_point(self.pending_p0, fill="#1d4ed8", tags="pending")
+
+    def draw_item(self, op_type, obj):
+        if self._redraw_pending:
+            return  # the pending rebuild draws it
+        draw = {"add_segment": self.draw_segment,
+                "add_point": self.draw_special_point,
+                "add_puncture": self.draw_puncture}[op_type]
+        draw(obj)
+        self.draw_pending()
+
+    def erase_item(self, obj_id):
+        if self._redraw_pending:
+            return  # the pending rebuild drops it
+        self.canvas.delete(obj_id)
+        del self._item_ids[obj_id]
+        self.draw_pending()
 
     def draw_grid(self):
         # lines at every integer from -WORLD_RANGE to +WORLD_RANGE
-        for i in range(-WORLD_RANGE, WORLD_RANGE + 1):
-            sx, _ = self.world_to_screen(i, 0)
-            color = "#f3f4f6" if i % GRID_MAJOR_EVERY == 0 else "#fafafa"
-            self.canvas.create_line(sx, 0, sx, self.canvas.winfo_height(), fill=color)
-        for j in range(-WORLD_RANGE, WORLD_RANGE + 1):
-            _, sy = self.world_to_screen(0, j)
-            color = "#f3f4f6" if j % GRID_MAJOR_EVERY == 0 else "#fafafa"
-            self.canvas.create_line(0, sy, self.canvas.winfo_width(), sy, fill=color)
+        # batched into one create_line per (direction, color) instead of one per grid line
+        w, h = self._w, self._h
+        steps = range(-WORLD_RANGE, WORLD_RANGE + 1)
+        for color, major in (("#f3f4f6", True), ("#fafafa", False)):
+            idx = [i for i in steps if (i % GRID_MAJOR_EVERY == 0) == major]
+            if not idx:
+                continue
+            xs = [self._cx + i * self.px_per_unit for i in idx]
+            ys = [self._cy - j * self.px_per_unit for j in idx]
+            self.canvas.create_line(*zigzag_coords(xs, 0, h, vertical=True), fill=color, tags="grid")
+            self.canvas.create_line(*zigzag_coords(ys, 0, w, vertical=False), fill=color, tags="grid")
         # visible border for the world box (optional)
         if WORLD_BORDER_VISIBLE:
             xL, yT = self.world_to_screen(-WORLD_RANGE,  WORLD_RANGE)
             xR, yB = self.world_to_screen( WORLD_RANGE, -WORLD_RANGE)
-            self.canvas.create_rectangle(xL, yT, xR, yB, outline="#cbd5e1")
+            self.canvas.create_rectangle(xL, yT, xR, yB, outline="#cbd5e1", tags="grid")
 
     def draw_axes(self):
-        w = self.canvas.winfo_width()
-        h = self.canvas.winfo_height()
-        self.canvas.create_line(0, h/2, w, h/2, fill="#94a3b8", width=1.5)
-        self.canvas.create_line(w/2, 0, w/2, h, fill="#94a3b8", width=1.5)
+        w, h = self._w, self._h
+        self.canvas.create_line(0, h/2, w, h/2, fill="#94a3b8", width=1.5, tags="axes")
+        self.canvas.create_line(w/2, 0, w/2, h, fill="#94a3b8", width=1.5, tags="axes")
 
-    def draw_point(self, p, fill="#1d4ed8"):
-        sx, sy = self.world_to_screen(to_float(p[0]), to_float(p[1]))
-        r = 4
-        self.canvas.create_oval(sx-r, sy-r, sx+r, sy+r, fill=fill, outline="")
+    def point_bbox(self, p, r):
+        sx, sy = self.world_to_screen(p[0], p[1])
+        return sx-r, sy-r, sx+r, sy+r
 
-    def draw_segment(self, seg):
+    def draw_point(self, p, fill="#1d4ed8", tags=()):
+        return self.canvas.create_oval(*self.point_bbox(p, 4), fill=fill, outline="", tags=tags)
+
+    def segment_coords(self, seg):
+        # line, label, P0 dot, P1 dot
         x0, y0 = seg["p0"]; x1, y1 = seg["p1"]
         s0 = self.world_to_screen(x0, y0)
         s1 = self.world_to_screen(x1, y1)
-        self.canvas.create_line(*s0, *s1, fill=seg["color"], width=2)
-        mx = (x0 + x1)/2
-        my = (y0 + y1)/2
-        smx, smy = self.world_to_screen(mx, my)
-        self.canvas.create_text(smx, smy - 12, text=seg["id"], fill="#111827",
-                                font=("TkDefaultFont", 10, "bold"))
-        # endpoint dots (aid snapping)
-        self.draw_point((x0, y0), fill="#1f2937")
-        self.draw_point((x1, y1), fill="#1f2937")
+        smx, smy = self.world_to_screen((x0 + x1)/2, (y0 + y1)/2)
+        return (*s0, *s1), (smx, smy - 12), self.point_bbox(seg["p0"], 4), self.point_bbox(seg["p1"], 4)
+
+    def special_point_coords(self, sp):
+        # dot, label
+        sx, sy = self.world_to_screen(*sp["xy"])
+        return self.point_bbox(sp["xy"], 4), (sx + 10, sy - 8)
 
-    def draw_puncture(self, p, label=None):
-        sx, sy = self.world_to_screen(to_float(p[0]), to_float(p[1]))
-        r = 6
-        self.canvas.create_oval(sx-r, sy-r, sx+r, sy+r, outline="#f59e0b", width=2)
-        if label:
-            self.canvas.create_text(sx + 10, sy + 10, text=label, fill="#f59e0b",
-                                    font=("TkDefaultFont", 10, "bold"))
+    def puncture_coords(self, pu):
+        # ring, label
+        sx, sy = self.world_to_screen(*pu["xy"])
+        return self.point_bbox(pu["xy"], 6), (sx + 10, sy + 10)
+
+    def draw_segment(self, seg):
+        tags = ("seg", seg["id"])
+        line_xy, label_xy, d0_box, d1_box = self.segment_coords(seg)
+        line = self.canvas.create_line(*line_xy, fill=seg["color"], width=2, tags=tags)
+        label = self.canvas.create_text(*label_xy, text=seg["id"], fill="#111827",
+                                        font=("TkDefaultFont", 10, "bold"), tags=tags)
+        # endpoint dots (aid snapping)
+        d0 = self.canvas.create_oval(*d0_box, fill="#1f2937", outline="", tags=tags)
+        d1 = self.canvas.create_oval(*d1_box, fill="#1f2937", outline="", tags=tags)
+        self._item_ids[seg["id"]] = (line, label, d0, d1)
+        # keep special points and punctures stacked above segments
+        self.canvas.tag_raise("sp")
+        self.canvas.tag_raise("puncture")
+
+    def draw_special_point(self, sp):
+        tags = ("sp", sp["id"])
+        dot_box, label_xy = self.special_point_coords(sp)
+        dot_id = self.canvas.create_oval(*dot_box, fill="#ef4444", outline="", tags=tags)
+        label = self.canvas.create_text(*label_xy, text=sp["id"], fill="#ef4444",
+                                        font=("TkDefaultFont", 10, "bold"), tags=tags)
+        self._item_ids[sp["id"]] = (dot_id, label)
+        self.canvas.tag_raise("puncture")
+
+    def draw_puncture(self, pu):
+        tags = ("puncture", pu["id"])
+        ring_box, label_xy = self.puncture_coords(pu)
+        ring = self.canvas.create_oval(*ring_box, outline="#f59e0b", width=2, tags=tags)
+        label = self.canvas.create_text(*label_xy, text=pu["id"], fill="#f59e0b",
+                                        font=("TkDefaultFont", 10, "bold"), tags=tags)
+        self._item_ids[pu["id"]] = (ring, label)
 
     # ----- Sidebar content -----
     def render_sidebar(self, status=None):
-        self.info.configure(state="normal")
-        self.info.delete("1.0", "end")
+        # several handlers may refresh the sidebar during one event; build it once when idle
+        self._sidebar_status = status
+        if self._sidebar_after_id is None:
+            self._sidebar_after_id = self.root.after_idle(self.flush_sidebar)
+
+    def flush_sidebar(self):
+        self._sidebar_after_id = None
+        status = self._sidebar_status
+        parts = []
 
         mode_name = {"segment": "Segments [1]", "point": "Special Points [2]", "puncture": "Punctures [3/P]"}[self.mode]
-        self.info.insert("end", f"Mode: {mode_name}\n")
-        self.info.insert("end", f"Chain Mode [L]: {'ON' if self.chain_mode else 'OFF'}\n")
-        self.info.insert("end", f"Snap-to-integer [S]: {'ON' if self.snap_to_integer else 'OFF'}\n")
-        self.info.insert("end", f"px/unit: {self.px_per_unit}\n")
+        parts.append(f"Mode: {mode_name}\n")
+        parts.append(f"Chain Mode [L]: {'ON' if self.chain_mode else 'OFF'}\n")
+        parts.append(f"Snap-to-integer [S]: {'ON' if self.snap_to_integer else 'OFF'}\n")
+        parts.append(f"px/unit: {self.px_per_unit}\n")
         # Undo/Redo availability
-        avail = f"Undo:{'Y' if len(self.history)>1 else 'N'}  Redo:{'Y' if bool(self.future) else 'N'}"
-        self.info.insert("end", f"{avail}\n")
+        avail = f"Undo:{'Y' if self.history else 'N'}  Redo:{'Y' if bool(self.future) else 'N'}"
+        parts.append(f"{avail}\n")
         if status:
-            self.info.insert("end", f"{status}\n")
-        self.info.insert("end", "Keys: 1=Segments, 2=Points, 3/P=Punctures, L=Chain, S=Snap, R=Reset, G=Grid, "
-                                "C=Copy Text, J=Copy JSON, Shift+J/Ctrl+S=Save JSON, Ctrl+Z=Undo, Ctrl+Y=Redo\n\n")
+            parts.append(f"{status}\n")
+        parts.append("Keys: 1=Segments, 2=Points, 3/P=Punctures, L=Chain, S=Snap, R=Reset, G=Grid, "
+                     "C=Copy Text, J=Copy JSON, Shift+J/Ctrl+S=Save JSON, Ctrl+Z=Undo, Ctrl+Y=Redo\n\n")
 
         if self.segments:
-            self.info.insert("end", "Segments:\n")
+            parts.append("Segments:\n")
             for seg in self.segments:
                 p0 = seg["p0"]; p1 = seg["p1"]
                 vx, vy = (p1[0] - p0[0]), (p1[1] - p0[1])
@@ -538,32 +785,35 @@ class App:
                 vxs, vys = frac_fmt(vx), frac_fmt(vy)
                 xmin = frac_min(p0[0], p1[0]); xmax = frac_max(p0[0], p1[0])
                 ymin = frac_min(p0[1], p1[1]); ymax = frac_max(p0[1], p1[1])
-                self.info.insert("end", f"  {seg['id']}: r(t)=({x0s},{y0s}) + t·({vxs},{vys}),  t∈[0,1]\n")
-                self.info.insert("end", f"       x∈[{frac_fmt(xmin)}, {frac_fmt(xmax)}],  y∈[{frac_fmt(ymin)}, {frac_fmt(ymax)}]\n")
-            self.info.insert("end", "\n")
+                parts.append(f"  {seg['id']}: r(t)=({x0s},{y0s}) + t·({vxs},{vys}),  t∈[0,1]\n")
+                parts.append(f"       x∈[{frac_fmt(xmin)}, {frac_fmt(xmax)}],  y∈[{frac_fmt(ymin)}, {frac_fmt(ymax)}]\n")
+            parts.append("\n")
         else:
-            self.info.insert("end", "No segments yet. Press [1] and click P0, then P1.\n\n")
+            parts.append("No segments yet. Press [1] and click P0, then P1.\n\n")
 
         if self.special_points:
-            self.info.insert("end", "Special points:\n")
+            parts.append("Special points:\n")
             for sp in self.special_points:
                 x, y = sp["xy"]
-                self.info.insert("end",
+                parts.append(
                     f"  {sp['id']}: on {sp['seg_id']} at t={frac_fmt(sp['t'])},  "
                     f"coords=({frac_fmt(x)}, {frac_fmt(y)})\n")
-            self.info.insert("end", "\n")
+            parts.append("\n")
         else:
-            self.info.insert("end", "No special points yet. Press [2] and click near a segment.\n")
+            parts.append("No special points yet. Press [2] and click near a segment.\n")
 
         if self.punctures:
-            self.info.insert("end", "Punctures:\n")
+            parts.append("Punctures:\n")
             for pu in self.punctures:
                 x, y = pu["xy"]
-                self.info.insert("end", f"  {pu['id']}: ({frac_fmt(x)}, {frac_fmt(y)})\n")
-            self.info.insert("end", "\n")
+                parts.append(f"  {pu['id']}: ({frac_fmt(x)}, {frac_fmt(y)})\n")
+            parts.append("\n")
         else:
-            self.info.insert("end", "No punctures yet. Press [3] or [P], then click to place.\n")
+            parts.append("No punctures yet. Press [3] or [P], then click to place.\n")
 
+        # one replace instead of a delete plus an insert per line
+        self.info.configure(state="normal")
+        self.info.replace("1.0", "end", "".join(parts))
         self.info.configure(state="disabled")
 
     # ----- Clipboard & File exports -----
@@ -596,7 +846,9 @@ class App:
         return "\n".join(lines)
 
     def export_json(self):
-        
+        # cached until the next push_state/undo/redo changes the data
+        if self._export_cache is not None:
+            return self._export_cache
         data = {
             "segments": [
                 {
@@ -623,7 +875,8 @@ class App:
                 for pu in self.punctures
             ],
         }
-        return json.dumps(data, indent=2)
+        self._export_cache = dumps_json(data)
+        return self._export_cache
 
     def copy_text(self):
         text = self.export_text()